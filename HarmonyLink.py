@@ -1,7 +1,37 @@
-import sqlite3
+import atexit
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
-DB_NAME = "harmonylink.db"
+# prefer a pysqlite3 built against a trimmed SQLite (see README), otherwise
+# fall back to the stdlib module; the API is the same
+try:
+    import pysqlite3 as sqlite3
+except ImportError:
+    import sqlite3
+
+DB_FILE = "harmonylink.db"
+
+# demo mode builds everything in a throwaway database (no fsyncs) and saves
+# one snapshot at the end; it is a real file rather than :memory: so that
+# every thread's connection sees the same data and WAL still applies
+DEMO_MODE = bool(os.environ.get("HARMONYLINK_DEMO"))
+_DEMO_DIR = tempfile.mkdtemp(prefix="harmonylink_demo_") if DEMO_MODE else None
+DB_NAME = os.path.join(_DEMO_DIR, DB_FILE) if DEMO_MODE else DB_FILE
+
+# one connection per thread, opened on first use; _CONNS tracks the open ones
+# weakly so close_connection() can reach them, while a thread's connection is
+# still released with the thread
+_LOCAL = threading.local()
+_CONNS = weakref.WeakSet()
+_CONNS_LOCK = threading.Lock()
 
 # script crate table
 SCHEMA_SQL = """
@@ -11,7 +41,7 @@ PRAGMA foreign_keys = ON;
 -- 1)  Users
 -------------------------------------------------------
 CREATE TABLE IF NOT EXISTS users (
-    user_id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id        INTEGER PRIMARY KEY,
     name           TEXT NOT NULL,
     email          TEXT NOT NULL UNIQUE,
     password_hash  TEXT NOT NULL,
@@ -22,7 +52,7 @@ CREATE TABLE IF NOT EXISTS users (
 -- 2)   Mood Sessions
 -------------------------------------------------------
 CREATE TABLE IF NOT EXISTS mood_sessions (
-    session_id     INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id     INTEGER PRIMARY KEY,
     user_id        INTEGER NOT NULL,
     stress_level   INTEGER NOT NULL CHECK (stress_level BETWEEN 1 AND 5),
     q1_answer      TEXT,
@@ -45,19 +75,11 @@ CREATE TABLE IF NOT EXISTS breathing_levels (
     base_points      INTEGER NOT NULL
 );
 
-INSERT OR IGNORE INTO breathing_levels (level_id, title, description, duration_seconds, base_points)
-VALUES
-    (1, 'Level 1 - Easy',   'Short and simple breathing exercise.',   60,  10),
-    (2, 'Level 2 - Light',  'Slightly longer breathing exercise.',    120, 20),
-    (3, 'Level 3 - Medium', 'Moderate breathing exercise.',           180, 30),
-    (4, 'Level 4 - Hard',   'Longer and more intense breathing.',     240, 40),
-    (5, 'Level 5 - Expert', 'Longest and most challenging exercise.', 300, 50);
-
 -------------------------------------------------------
 -- 4)    Breathing Sessions
 -------------------------------------------------------
 CREATE TABLE IF NOT EXISTS breathing_sessions (
-    breathing_session_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    breathing_session_id INTEGER PRIMARY KEY,
     user_id              INTEGER NOT NULL,
     session_id           INTEGER,
     level_id             INTEGER NOT NULL,
@@ -81,210 +103,518 @@ CREATE TABLE IF NOT EXISTS user_stats (
     
     FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
 );
+
+-------------------------------------------------------
+-- 6)   Indexes (foreign-key columns, used by cascades)
+-------------------------------------------------------
+CREATE INDEX IF NOT EXISTS idx_mood_user    ON mood_sessions(user_id);
+CREATE INDEX IF NOT EXISTS idx_br_user      ON breathing_sessions(user_id);
+CREATE INDEX IF NOT EXISTS idx_br_session   ON breathing_sessions(session_id);
+CREATE INDEX IF NOT EXISTS idx_br_level     ON breathing_sessions(level_id);
+
+-------------------------------------------------------
+-- 7)   Triggers (keep user_stats in step with users and sessions)
+-------------------------------------------------------
+-- plain INSERT on purpose: a stale row for a reused id must fail loudly rather
+-- than hand the old points to the new user (the rowid migration removes them)
+CREATE TRIGGER IF NOT EXISTS trg_user_stats
+AFTER INSERT ON users
+BEGIN
+    INSERT INTO user_stats (user_id) VALUES (NEW.user_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_mood_pts
+AFTER INSERT ON mood_sessions
+BEGIN
+    UPDATE user_stats
+    SET
+        total_points = total_points + NEW.points_earned,
+        current_streak_days =
+            CASE
+                WHEN last_activity_date = DATE('now', '-1 day')
+                    THEN current_streak_days + 1
+                WHEN last_activity_date = DATE('now')
+                    THEN current_streak_days
+                ELSE 1
+            END,
+        last_activity_date = DATE('now')
+    WHERE user_id = NEW.user_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_breathing_pts
+AFTER INSERT ON breathing_sessions
+BEGIN
+    UPDATE user_stats
+    SET
+        total_points = total_points + NEW.points_earned,
+        current_streak_days =
+            CASE
+                WHEN last_activity_date = DATE('now', '-1 day')
+                    THEN current_streak_days + 1
+                WHEN last_activity_date = DATE('now')
+                    THEN current_streak_days
+                ELSE 1
+            END,
+        last_activity_date = DATE('now')
+    WHERE user_id = NEW.user_id;
+END;
+"""
+
+# seed rows for breathing_levels, inserted by init_db
+# (level_id, title, description, duration_seconds, base_points)
+_LEVELS = (
+    (1, "Level 1 - Easy",   "Short and simple breathing exercise.",   60,  10),
+    (2, "Level 2 - Light",  "Slightly longer breathing exercise.",    120, 20),
+    (3, "Level 3 - Medium", "Moderate breathing exercise.",           180, 30),
+    (4, "Level 4 - Hard",   "Longer and more intense breathing.",     240, 40),
+    (5, "Level 5 - Expert", "Longest and most challenging exercise.", 300, 50),
+)
+
+
+# ----------------- QUERIES ----------------- #
+# kept as constants so each statement text is compiled once and then served
+# from the connection's statement cache
+
+# the user_stats row is created by trg_user_stats
+_SQL_INSERT_USER = """
+    INSERT INTO users (name, email, password_hash)
+    VALUES (?, ?, ?)
+    RETURNING user_id
+"""
+
+_SQL_INSERT_LEVEL = """
+    INSERT OR IGNORE INTO breathing_levels
+        (level_id, title, description, duration_seconds, base_points)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_MOOD = """
+    INSERT INTO mood_sessions
+        (user_id, stress_level, q1_answer, q2_answer, q3_answer, points_earned)
+    VALUES (?, ?, ?, ?, ?, ?)
 """
 
+_SQL_INSERT_BREATHING = """
+    INSERT INTO breathing_sessions
+        (user_id, session_id, level_id, points_earned)
+    VALUES (?, ?, ?, ?)
+"""
+
+# today/yesterday are computed once in the CTE instead of per DATE() call
+_SQL_UPDATE_STATS = """
+    WITH t(today, yday) AS (SELECT DATE('now'), DATE('now', '-1 day'))
+    UPDATE user_stats
+    SET
+        total_points = total_points + ?,
+        current_streak_days =
+            CASE
+                WHEN last_activity_date = (SELECT yday FROM t)
+                    THEN current_streak_days + 1
+                WHEN last_activity_date = (SELECT today FROM t)
+                    THEN current_streak_days
+                ELSE 1
+            END,
+        last_activity_date = (SELECT today FROM t)
+    WHERE user_id = ?
+"""
+
+# kind -> (table, key column) for delete(); internal constants only,
+# never build these from user input
+_DELETE_TABLES = {
+    "user": ("users", "user_id"),
+    "mood": ("mood_sessions", "session_id"),
+    "breathing": ("breathing_sessions", "breathing_session_id"),
+    "level": ("breathing_levels", "level_id"),
+    "stats": ("user_stats", "user_id"),
+}
+
+_SQL_DELETE = {
+    kind: f"DELETE FROM {table} WHERE {col} = ?"
+    for kind, (table, col) in _DELETE_TABLES.items()
+}
+
+# columns shown by the print_* functions (password_hash is never printed)
+_USER_COLS = ("user_id", "name", "email", "created_at")
+_MOOD_COLS = ("session_id", "user_id", "stress_level", "q1_answer", "q2_answer",
+              "q3_answer", "points_earned", "created_at")
+_LEVEL_COLS = ("level_id", "title", "description", "duration_seconds", "base_points")
+_BREATHING_COLS = ("breathing_session_id", "user_id", "session_id", "level_id",
+                   "started_at", "completed_at", "points_earned")
+_STATS_COLS = ("user_id", "total_points", "current_streak_days", "last_activity_date")
+
+_SQL_SELECT_USERS = f"SELECT {', '.join(_USER_COLS)} FROM users"
+
+_SQL_SELECT_MOOD = f"SELECT {', '.join(_MOOD_COLS)} FROM mood_sessions"
+
+_SQL_SELECT_LEVELS = f"SELECT {', '.join(_LEVEL_COLS)} FROM breathing_levels"
+
+_SQL_SELECT_BREATHING = f"SELECT {', '.join(_BREATHING_COLS)} FROM breathing_sessions"
+
+_SQL_SELECT_STATS = f"SELECT {', '.join(_STATS_COLS)} FROM user_stats"
+
+# (title, table, columns, select) for print_all / print_all_threaded,
+# in print order
+_PRINT_TABLES = (
+    ("USERS", "users", _USER_COLS, _SQL_SELECT_USERS),
+    ("MOOD SESSIONS", "mood_sessions", _MOOD_COLS, _SQL_SELECT_MOOD),
+    ("BREATHING LEVELS", "breathing_levels", _LEVEL_COLS, _SQL_SELECT_LEVELS),
+    ("BREATHING SESSIONS", "breathing_sessions", _BREATHING_COLS, _SQL_SELECT_BREATHING),
+    ("USER STATS", "user_stats", _STATS_COLS, _SQL_SELECT_STATS),
+)
+
+
+def _json_pairs(cols):
+    return ", ".join(f"'{c}', {c}" for c in cols)
+
+
+# every table in one statement: (index into _PRINT_TABLES, rowid, row as a
+# JSON object), ordered explicitly since UNION ALL alone guarantees no order
+_SQL_SELECT_ALL = "\nUNION ALL\n".join(
+    f"SELECT {i}, rowid, json_object({_json_pairs(cols)}) FROM {table}"
+    for i, (_, table, cols, _) in enumerate(_PRINT_TABLES)
+) + "\nORDER BY 1, 2"
+
+
+class _Connection(sqlite3.Connection):
+    # plain sqlite3.Connection can't be weakly referenced
+    pass
+
 
 def get_connection():
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = sqlite3.Row
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is None or conn not in _CONNS:
+        # autocommit mode: writers open their own transactions,
+        # see _write_transaction()
+        conn = sqlite3.connect(
+            DB_NAME,
+            isolation_level=None,
+            timeout=30.0,
+            check_same_thread=False,
+            cached_statements=256,
+            factory=_Connection,
+        )
+
+        # per-connection settings (not stored in the db file)
+        conn.execute("PRAGMA foreign_keys = ON")
+        # the demo database is thrown away, so it can skip fsyncs entirely
+        conn.execute(f"PRAGMA synchronous = {'OFF' if DEMO_MODE else 'NORMAL'}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -20000")  # ~20 MB
+        conn.execute("PRAGMA mmap_size = 268435456")  # 256 MB
+        _LOCAL.conn = conn
+        with _CONNS_LOCK:
+            _CONNS.add(conn)
     return conn
 
 
+def close_connection():
+    # closes the connections of all threads
+    with _CONNS_LOCK:
+        conns = list(_CONNS)
+        _CONNS.clear()
+    for conn in conns:
+        conn.close()
+
+
+def _remove_demo_dir():
+    if _DEMO_DIR is not None:
+        shutil.rmtree(_DEMO_DIR, ignore_errors=True)
+
+
+# atexit runs in reverse order: connections are closed before the demo
+# database is removed
+atexit.register(_remove_demo_dir)
+atexit.register(close_connection)
+
+
+@contextmanager
+def _write_transaction():
+    # take the write lock up front so a busy database waits in the busy
+    # handler instead of failing on a deferred -> reserved lock upgrade
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    with conn:
+        yield conn
+
+
+# tables that were created with AUTOINCREMENT by older versions of the schema
+_ROWID_TABLES = ("users", "mood_sessions", "breathing_sessions")
+
+
+# older versions never enabled foreign keys, so deletes did not cascade and
+# left rows pointing at deleted parents; without AUTOINCREMENT those ids are
+# handed out again, and the leftovers would attach to the new owner
+_SQL_DELETE_ORPHANS = """
+    DELETE FROM mood_sessions
+    WHERE user_id NOT IN (SELECT user_id FROM users);
+
+    DELETE FROM breathing_sessions
+    WHERE user_id NOT IN (SELECT user_id FROM users);
+
+    DELETE FROM user_stats
+    WHERE user_id NOT IN (SELECT user_id FROM users);
+
+    UPDATE breathing_sessions SET session_id = NULL
+    WHERE session_id IS NOT NULL
+      AND session_id NOT IN (SELECT session_id FROM mood_sessions);
+"""
+
+
+def _migrate_autoincrement(conn):
+    # rebuild old AUTOINCREMENT tables as plain rowid tables, keeping all rows
+    # and ids; indexes/triggers dropped with them are recreated by SCHEMA_SQL
+    steps = []
+    for name, sql in conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name IN (?, ?, ?)",
+        _ROWID_TABLES,
+    ):
+        if "AUTOINCREMENT" not in sql.upper():
+            continue
+        # the stored name may be quoted (SQLite writes "users" after a RENAME)
+        new_sql = re.sub(
+            rf"""^CREATE\s+TABLE\s+["'`\[]?{name}["'`\]]?""",
+            f"CREATE TABLE {name}_new",
+            sql,
+            count=1,
+            flags=re.IGNORECASE,
+        )
+        new_sql = re.sub(r"\s+AUTOINCREMENT\b", "", new_sql, flags=re.IGNORECASE)
+        steps.append(f"""
+            {new_sql};
+            INSERT INTO {name}_new SELECT * FROM {name};
+            DROP TABLE {name};
+            ALTER TABLE {name}_new RENAME TO {name};
+        """)
+
+    if not steps:
+        return
+
+    # foreign keys must be off while parents are dropped, or the rows
+    # referencing them would be cascaded away
+    try:
+        conn.executescript(
+            "PRAGMA foreign_keys = OFF; BEGIN;"
+            + "".join(steps)
+            + _SQL_DELETE_ORPHANS
+        )
+        # init_db re-seeds the levels anyway; doing it here first keeps
+        # sessions on a deleted default level from failing the check below
+        conn.executemany(_SQL_INSERT_LEVEL, _LEVELS)
+        violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+        if violations:
+            raise sqlite3.IntegrityError(
+                f"foreign key violations left after migration: {violations}"
+            )
+        conn.execute("COMMIT")
+        conn.execute("PRAGMA foreign_keys = ON")
+    except sqlite3.Error:
+        # don't leave the cached connection mid-transaction with FKs off
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        conn.execute("PRAGMA foreign_keys = ON")
+        raise
+
+
 def init_db():
     conn = get_connection()
     cur = conn.cursor()
+    _migrate_autoincrement(conn)
     cur.executescript(SCHEMA_SQL)
-    conn.commit()
-    conn.close()
 
+    with _write_transaction() as conn:
+        conn.executemany(_SQL_INSERT_LEVEL, _LEVELS)
 
-# ----------------- CREATE FUNCTIONS ----------------- #
+    # WAL is persistent, so setting it once at creation is enough
+    # (must run outside a transaction)
+    cur.execute("PRAGMA journal_mode = WAL")
 
-def create_user(name, email, password_hash):
-    conn = get_connection()
-    cur = conn.cursor()
+    # planner statistics for the indexes above: a full ANALYZE only on first
+    # run, afterwards let SQLite refresh them when it thinks they are stale
+    has_stats = cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    ).fetchone()
+    cur.execute("PRAGMA optimize" if has_stats else "ANALYZE")
 
-    cur.execute("""
-        INSERT INTO users (name, email, password_hash)
-        VALUES (?, ?, ?)
-    """, (name, email, password_hash))
 
-    user_id = cur.lastrowid
+# ----------------- CREATE FUNCTIONS ----------------- #
 
-    cur.execute("INSERT INTO user_stats (user_id) VALUES (?)", (user_id,))
-    conn.commit()
-    conn.close()
-    return user_id
+def create_user(name, email, password_hash):
+    with _write_transaction() as conn:
+        row = conn.execute(_SQL_INSERT_USER, (name, email, password_hash)).fetchone()
+    return row[0]
 
 
 def add_mood_session(user_id, stress_level, q1=None, q2=None, q3=None, points_earned=0):
-    conn = get_connection()
-    cur = conn.cursor()
+    with _write_transaction() as conn:
+        cur = conn.execute(_SQL_INSERT_MOOD,
+                           (user_id, stress_level, q1, q2, q3, points_earned))
+    return cur.lastrowid
 
-    cur.execute("""
-        INSERT INTO mood_sessions
-            (user_id, stress_level, q1_answer, q2_answer, q3_answer, points_earned)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (user_id, stress_level, q1, q2, q3, points_earned))
 
-    sid = cur.lastrowid
-    conn.commit()
-    conn.close()
-    return sid
+def add_breathing_session(user_id, level_id, session_id=None, points_earned=0):
+    with _write_transaction() as conn:
+        cur = conn.execute(_SQL_INSERT_BREATHING,
+                           (user_id, session_id, level_id, points_earned))
+    return cur.lastrowid
 
 
-def add_breathing_session(user_id, level_id, session_id=None, points_earned=0):
-    conn = get_connection()
-    cur = conn.cursor()
+def add_mood_sessions_bulk(rows):
+    # rows: iterable of (user_id, stress_level, q1, q2, q3, points_earned)
+    with _write_transaction() as conn:
+        cur = conn.executemany(_SQL_INSERT_MOOD, rows)
+    return cur.rowcount
 
-    cur.execute("""
-        INSERT INTO breathing_sessions
-            (user_id, session_id, level_id, points_earned)
-        VALUES (?, ?, ?, ?)
-    """, (user_id, session_id, level_id, points_earned))
 
-    bid = cur.lastrowid
-    conn.commit()
-    conn.close()
-    return bid
+def add_breathing_sessions_bulk(rows):
+    # rows: iterable of (user_id, session_id, level_id, points_earned)
+    with _write_transaction() as conn:
+        cur = conn.executemany(_SQL_INSERT_BREATHING, rows)
+    return cur.rowcount
 
 # ----------------- update user stats FUNCTIONS ----------------- #
 
+# session inserts already credit their points_earned through the
+# trg_*_pts triggers; call this only for points awarded outside a session
+
 def update_user_stats(user_id, added_points):
-    conn = get_connection()
-    cur = conn.cursor()
+    with _write_transaction() as conn:
+        conn.execute(_SQL_UPDATE_STATS, (added_points, user_id))
 
-    cur.execute("""
-        UPDATE user_stats
-        SET
-            total_points = total_points + ?,
-            current_streak_days =
-                CASE
-                    WHEN last_activity_date = DATE('now', '-1 day')
-                        THEN current_streak_days + 1
-                    WHEN last_activity_date = DATE('now')
-                        THEN current_streak_days
-                    ELSE 1
-                END,
-            last_activity_date = DATE('now')
-        WHERE user_id = ?
-    """, (added_points, user_id))
-
-    conn.commit()
-    conn.close()
+
+def record_session(user_id, stress_level, answers, breathing_level_id,
+                   mood_points=0, breathing_points=0):
+    # mood + breathing in a single transaction (one commit);
+    # user_stats is updated by the insert triggers
+    with _write_transaction() as conn:
+        sid = conn.execute(_SQL_INSERT_MOOD,
+                           (user_id, stress_level, *answers, mood_points)).lastrowid
+        bid = conn.execute(_SQL_INSERT_BREATHING,
+                           (user_id, sid, breathing_level_id, breathing_points)).lastrowid
+    return sid, bid
 
 
 # ----------------- DELETE FUNCTIONS ----------------- #
 
-def delete_user(user_id):
-    conn = get_connection()
-    cur = conn.cursor()
+def delete(kind, key):
+    # kind is one of _DELETE_TABLES; returns the number of rows deleted
+    sql = _SQL_DELETE.get(kind)
+    if sql is None:
+        raise ValueError(
+            f"unknown delete kind {kind!r}, expected one of: {', '.join(_SQL_DELETE)}"
+        )
+    with _write_transaction() as conn:
+        return conn.execute(sql, (key,)).rowcount
 
-    cur.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
-    conn.commit()
-    conn.close()
 
-    print(f"[✓] User {user_id} deleted successfully.")
+def _report_delete(deleted, label):
+    if deleted:
+        print(f"[✓] {label} deleted successfully.")
+    else:
+        print(f"[!] {label} not found.")
 
 
-def delete_mood_session(session_id):
-    conn = get_connection()
-    cur = conn.cursor()
+def delete_user(user_id):
+    _report_delete(delete("user", user_id), f"User {user_id}")
 
-    cur.execute("DELETE FROM mood_sessions WHERE session_id = ?", (session_id,))
-    conn.commit()
-    conn.close()
 
-    print(f"[✓] Mood session {session_id} deleted successfully.")
+def delete_mood_session(session_id):
+    _report_delete(delete("mood", session_id), f"Mood session {session_id}")
 
 
 def delete_breathing_session(breathing_session_id):
-    conn = get_connection()
-    cur = conn.cursor()
+    _report_delete(delete("breathing", breathing_session_id),
+                   f"Breathing session {breathing_session_id}")
 
-    cur.execute("""
-        DELETE FROM breathing_sessions
-        WHERE breathing_session_id = ?
-    """, (breathing_session_id,))
 
-    conn.commit()
-    conn.close()
+def delete_breathing_level(level_id):
+    _report_delete(delete("level", level_id), f"Breathing level {level_id}")
 
-    print(f"[✓] Breathing session {breathing_session_id} deleted successfully.")
 
+def delete_user_stats(user_id):
+    _report_delete(delete("stats", user_id), f"Stats for user {user_id}")
 
-def delete_breathing_level(level_id):
-    conn = get_connection()
-    cur = conn.cursor()
 
-    cur.execute("DELETE FROM breathing_levels WHERE level_id = ?", (level_id,))
-    conn.commit()
-    conn.close()
+# ----------------- PRINT FUNCTIONS ----------------- #
 
-    print(f"[✓] Breathing level {level_id} deleted successfully.")
+PRINT_BATCH_SIZE = 1000
 
 
-def delete_user_stats(user_id):
-    conn = get_connection()
-    cur = conn.cursor()
+def _iter_rows(sql):
+    # stream plain tuples in batches instead of building every Row up front
+    cur = get_connection().cursor()
+    cur.execute(sql)
+    cols = [d[0] for d in cur.description]
+    while True:
+        batch = cur.fetchmany(PRINT_BATCH_SIZE)
+        if not batch:
+            break
+        for row in batch:
+            yield dict(zip(cols, row))
 
-    cur.execute("DELETE FROM user_stats WHERE user_id = ?", (user_id,))
-    conn.commit()
-    conn.close()
 
-    print(f"[✓] Stats for user {user_id} deleted successfully.")
+def _print_rows(sql):
+    for row in _iter_rows(sql):
+        print(row)
 
 
-# ----------------- PRINT FUNCTIONS ----------------- #
+def _format_rows(sql):
+    return [str(row) for row in _iter_rows(sql)]
+
 
 def print_users():
-    conn = get_connection()
-    cur = conn.cursor()
-    rows = cur.execute("SELECT * FROM users").fetchall()
     print("\n===== USERS =====")
-    for r in rows:
-        print(dict(r))
-    conn.close()
+    _print_rows(_SQL_SELECT_USERS)
 
 
 def print_mood_sessions():
-    conn = get_connection()
-    cur = conn.cursor()
-    rows = cur.execute("SELECT * FROM mood_sessions").fetchall()
     print("\n===== MOOD SESSIONS =====")
-    for r in rows:
-        print(dict(r))
-    conn.close()
+    _print_rows(_SQL_SELECT_MOOD)
 
 
 def print_breathing_levels():
-    conn = get_connection()
-    cur = conn.cursor()
-    rows = cur.execute("SELECT * FROM breathing_levels").fetchall()
     print("\n===== BREATHING LEVELS =====")
-    for r in rows:
-        print(dict(r))
-    conn.close()
+    _print_rows(_SQL_SELECT_LEVELS)
 
 
 def print_breathing_sessions():
-    conn = get_connection()
-    cur = conn.cursor()
-    rows = cur.execute("SELECT * FROM breathing_sessions").fetchall()
     print("\n===== BREATHING SESSIONS =====")
-    for r in rows:
-        print(dict(r))
-    conn.close()
+    _print_rows(_SQL_SELECT_BREATHING)
 
 
 def print_user_stats():
-    conn = get_connection()
-    cur = conn.cursor()
-    rows = cur.execute("SELECT * FROM user_stats").fetchall()
     print("\n===== USER STATS =====")
-    for r in rows:
-        print(dict(r))
-    conn.close()
+    _print_rows(_SQL_SELECT_STATS)
+
+
+def print_all():
+    # same output as calling the five print_* functions, from a single query;
+    # public alongside print_all_threaded, which the demo uses
+    cur = get_connection().cursor()
+    titles = [title for title, _, _, _ in _PRINT_TABLES]
+    printed = 0
+    for index, _, row in cur.execute(_SQL_SELECT_ALL):
+        # headers up to this row's table, including any empty ones before it
+        while printed <= index:
+            print(f"\n===== {titles[printed]} =====")
+            printed += 1
+        print(json.loads(row))
+
+    # headers for trailing empty tables
+    for title in titles[printed:]:
+        print(f"\n===== {title} =====")
+
+
+def print_all_threaded(max_workers=2):
+    # tables are read and formatted on worker threads, each with its own
+    # connection (WAL, in demo mode too, so they can read while another
+    # thread commits), then printed here in table order so the output does
+    # not interleave
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_format_rows, sql) for _, _, _, sql in _PRINT_TABLES]
+        for (title, _, _, _), future in zip(_PRINT_TABLES, futures):
+            print(f"\n===== {title} =====")
+            for line in future.result():
+                print(line)
 
 
 # ----------------- RUN SCRIPT ----------------- #
@@ -295,16 +625,17 @@ if __name__ == "__main__":
     print("Database created successfully!")
 
     uid = create_user("Moamen User", "moamen@example.com", "hash123")
-    sid = add_mood_session(uid, 4, "tired", "not good", "need rest", 5)
-    bid = add_breathing_session(uid, 3, sid, 30)
-    update_user_stats(uid, 30)
+    sid, bid = record_session(uid, 4, ("tired", "not good", "need rest"), 3, 5, 30)
 
-    print_users()
-    print_mood_sessions()
-    print_breathing_levels()
-    print_breathing_sessions()
-    print_user_stats()
+    print_all_threaded()
 
     # delete_breathing_session(bid)
     # delete_mood_session(sid)
     # delete_user(uid)
+
+    if DEMO_MODE:
+        if Path(DB_FILE).exists():
+            print(f"{DB_FILE} already exists, demo snapshot not saved.")
+        else:
+            get_connection().execute("VACUUM INTO ?", (DB_FILE,))
+            print(f"Demo database saved to {DB_FILE}.")